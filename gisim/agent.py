@@ -1,10 +1,11 @@
 """Player & agent APIs
 """
+import sys
 from abc import ABC, abstractmethod
-from collections import Counter
-from typing import Dict, List, OrderedDict
+from typing import Dict, List, Optional, Tuple
 
 from gisim.cards.characters import get_character_card
+from gisim.cards.characters.base import CharacterCard
 from gisim.classes.action import (
     Action,
     ChangeCardsAction,
@@ -21,366 +22,394 @@ from gisim.classes.enums import (
     GamePhase,
     GameStatus,
     PlayerID,
-    SkillType,
 )
 from gisim.game import GameInfo
+from gisim.player_area import CharacterInfo, PlayerInfo
+
+_CARD_CACHE: Dict[str, CharacterCard] = {}
+_KANTEN_SENMYOU_BLESSING = sys.intern("Kanten Senmyou Blessing")
+_TRAVELERS_HANDY_SWORD = sys.intern("Traveler's Handy Sword")
+_SACRIFICIAL_SWORD = sys.intern("Sacrificial Sword")
+_DECLARE_END_ACTION = DeclareEndAction()
+"""Actions are immutable: the field-less declare-end action is built only once"""
+# Plain int values of the elements used in dice costs. `ElementType` is an IntEnum,
+# so dice and cost keys can be compared to these and used as list indices directly,
+# which is much faster than going through `.value` or the enum attributes.
+_OMNI = int(ElementType.OMNI)
+_ANY = int(ElementType.ANY)
+_SAME = int(ElementType.SAME)
+_DICE_ELEMENTS = tuple(ElementType(value) for value in range(8))
+"""Element of the dice by value (0 for OMNI), the very members found in dice zones"""
+_OMNI_DIE = ElementType.OMNI
+_CHARPOS_BY_IDX = (CharPos.LEFT, CharPos.MIDDLE, CharPos.RIGHT)
+"""`CharPos(k)` of the k-th character, without going through the enum lookup"""
+
+
+def _card(character_name: str) -> CharacterCard:
+    """Get the (read-only) character card of the given character name.
+    Cards are built once per name and shared by all agents, so agents should never mutate them.
+    """
+    character_card = _CARD_CACHE.get(character_name)
+    if character_card is None:
+        character_card = _CARD_CACHE[character_name] = get_character_card(
+            character_name
+        )
+    return character_card
+
+
+def _first_alive_pos(characters: List[CharacterInfo]) -> CharPos:
+    """Position of the first alive character, used to replace a fallen active character"""
+    for k, character in enumerate(characters):
+        if character.character.alive:
+            return _CHARPOS_BY_IDX[k]
+    raise ValueError("All characters have fallen.")
+
+
+def _reroll_indices(player_info: PlayerInfo) -> List[int]:
+    """Reroll all the dice that are neither OMNI nor of the element of Kamisato Ayaka"""
+    character_card = _card("Kamisato Ayaka")
+    kept_elements = frozenset((character_card.element_type, ElementType.OMNI))
+    return [
+        k
+        for k, element_type in enumerate(player_info.dice_zone)
+        if element_type not in kept_elements
+    ]
+
+
+def _round_end_action(player_info: PlayerInfo) -> Action:
+    """Replace the fallen active character if needed, otherwise declare end"""
+    characters = player_info.characters
+    if not characters[player_info.active_character_position.value].character.alive:
+        return ChangeCharacterAction(position=_first_alive_pos(characters), dice_idx=[])
+    return _DECLARE_END_ACTION
+
+
+def _count_dice(dice: List[ElementType]) -> List[int]:
+    """Number of dice of each element, indexed by element value (0 for OMNI)"""
+    counts = [0] * 8
+    for die in dice:
+        counts[die] += 1
+    return counts
+
+
+def _can_afford(cost: Dict[ElementType, int], counts: List[int]) -> bool:
+    """Cheap necessary check of `cost` against the dice counts of `_count_dice`.
+    False means the dice are surely insufficient; True still needs `_greedy_dice_alloc` to confirm.
+    """
+    omni_count = counts[_OMNI]
+    required = 0
+    for key, val in cost.items():
+        if 1 <= key <= 7:
+            if counts[key] + omni_count < val:
+                return False
+        elif key == _SAME:
+            if max(counts[1:]) + omni_count < val:
+                return False
+        elif key != _ANY:
+            # Power and other non-dice costs
+            continue
+        required += val
+    return required <= sum(counts)
+
+
+def _take_dice(
+    dice: List[ElementType],
+    element: ElementType,
+    num: int,
+    taken: List[int],
+    start: List[int],
+) -> List[int]:
+    """Indices of the next `num` unused dice of `element`, which are then marked as used"""
+    index = dice.index
+    pos = start[element]
+    dice_idx: List[int] = []
+    for _ in range(num):
+        pos = index(element, pos)
+        dice_idx.append(pos)
+        pos += 1
+    taken[element] += num
+    start[element] = pos
+    return dice_idx
+
+
+def _greedy_dice_alloc(
+    dice: List[ElementType],
+    cost: Dict[ElementType, int],
+    char_element: ElementType,
+    dice_counts: Optional[List[int]] = None,
+) -> List[int]:
+    """Greedily pick the dice paying `cost`; returns an empty list if the dice are insufficient.
+    Kept free of agent state so that it can be called (or compiled) on its own.
+    `dice_counts` is the result of `_count_dice(dice)`; without it, only the
+    elements referred to by `cost` are counted.
+    """
+    # Dice of an element are always used in the order they appear: `taken[e]`
+    # dice of element `e` are already used, and the next one is searched from
+    # index `start[e]` on.
+    taken: List[int] = [0] * 8
+    start: List[int] = [0] * 8
+    dice_idx: List[int] = []
+    for key, val in cost.items():
+        if 1 <= key <= 7:
+            # 7 majors elements, take OMNI elements if insufficient
+            if dice_counts is not None:
+                num = dice_counts[key] - taken[key]
+                omni_num = dice_counts[_OMNI] - taken[_OMNI]
+            else:
+                num = dice.count(key) - taken[key]
+                omni_num = dice.count(_OMNI_DIE) - taken[_OMNI] if num < val else 0
+            if num >= val:
+                num = val
+            elif num + omni_num < val:
+                # Insufficient dice
+                return []
+            index = dice.index
+            pos = start[key]
+            for _ in range(num):
+                pos = index(key, pos)
+                dice_idx.append(pos)
+                pos += 1
+            taken[key] += num
+            start[key] = pos
+            if num < val:
+                dice_idx += _take_dice(dice, _OMNI_DIE, val - num, taken, start)
+        elif key == _ANY:
+            # Arbitrary element: take the dice (including OMNI) without the
+            # character element first, in the order they appear
+            remaining = val
+            for idx, die in enumerate(dice):
+                if die != char_element and idx not in dice_idx:
+                    taken[die] += 1
+                    start[die] = idx + 1
+                    dice_idx.append(idx)
+                    remaining -= 1
+                    if remaining == 0:
+                        break
+            if remaining > 0:
+                # Insufficient unaligned dice: we then use the dice with character element
+                if not 1 <= char_element <= 7:
+                    return []
+                if dice_counts is not None:
+                    num = dice_counts[char_element]
+                else:
+                    num = dice.count(char_element)
+                if num - taken[char_element] < remaining:
+                    return []
+                dice_idx += _take_dice(dice, char_element, remaining, taken, start)
+        elif key == _SAME:
+            counts = dice_counts if dice_counts is not None else _count_dice(dice)
+            cnt = [counts[e] - taken[e] for e in range(8)]
+            omni_count = cnt[_OMNI]
+            # Other elements in hand, ranked by count and then by the index of
+            # their first available die
+            candidates = [
+                _DICE_ELEMENTS[e]
+                for e in range(1, 8)
+                if e != char_element and cnt[e] > 0
+            ]
+            # Prefer the least element that is sufficient by itself
+            enough = [e for e in candidates if cnt[e] >= val]
+            if enough:
+                element = min(enough, key=lambda e: (cnt[e], dice.index(e, start[e])))
+                dice_idx += _take_dice(dice, element, val, taken, start)
+                continue
+            if candidates:
+                # Use up the most element and fill the gap with OMNI elements
+                element = max(
+                    candidates, key=lambda e: (cnt[e], -dice.index(e, start[e]))
+                )
+                num = cnt[element]
+                if omni_count + num >= val:
+                    dice_idx += sorted(
+                        _take_dice(dice, element, num, taken, start)
+                        + _take_dice(dice, _OMNI_DIE, val - num, taken, start)
+                    )
+                    continue
+            char_elem_count = cnt[char_element] if 1 <= char_element <= 7 else 0
+            if char_elem_count + omni_count < val:
+                return []
+            num = min(char_elem_count, val)
+            if num > 0:
+                dice_idx += sorted(
+                    _take_dice(dice, char_element, num, taken, start)
+                    + _take_dice(dice, _OMNI_DIE, val - num, taken, start)
+                )
+            else:
+                dice_idx += _take_dice(dice, _OMNI_DIE, val, taken, start)
+
+    return dice_idx
 
 
 class Agent(ABC):
+    __slots__ = ("player_id",)
+
     def __init__(self, player_id: PlayerID):
         self.player_id = player_id
 
     @abstractmethod
-    def take_action(self, game_info: OrderedDict) -> Action:
+    def take_action(self, game_info: GameInfo) -> Action:
         pass
 
 
-class AttackOnlyAgent(Agent):
-    def __init__(self, player_id: PlayerID):
-        super().__init__(player_id)
+class PhaseDispatchAgent(Agent):
+    """Agent handling each (status, phase) of the game in its own method.
+    Subclasses implement `take_action_on_play_cards` and may override the other handlers.
+    """
+
+    __slots__ = ()
+
+    _DISPATCH: Dict[Tuple[GameStatus, GamePhase], str] = {
+        (
+            GameStatus.INITIALIZING,
+            GamePhase.CHANGE_CARD,
+        ): "take_action_on_init_change_card",
+        (
+            GameStatus.INITIALIZING,
+            GamePhase.SELECT_ACTIVE_CHARACTER,
+        ): "take_action_on_init_select_character",
+        (GameStatus.RUNNING, GamePhase.ROLL_DICE): "take_action_on_roll_dice",
+        (GameStatus.RUNNING, GamePhase.PLAY_CARDS): "take_action_on_play_cards",
+        (GameStatus.RUNNING, GamePhase.ROUND_END): "take_action_on_round_end",
+    }
+    """Name of the method handling each (status, phase) of the game"""
+
+    def take_action(self, game_info: GameInfo) -> Action:
+        handler_name = self._DISPATCH.get((game_info.status, game_info.phase))
+        if handler_name is None:
+            return _DECLARE_END_ACTION
+        return getattr(self, handler_name)(game_info)
+
+    def take_action_on_init_change_card(self, game_info: GameInfo) -> Action:
+        return ChangeCardsAction(cards_idx=[])
+
+    def take_action_on_init_select_character(self, game_info: GameInfo) -> Action:
+        return ChangeCharacterAction(position=CharPos.MIDDLE, dice_idx=[])
+
+    def take_action_on_roll_dice(self, game_info: GameInfo) -> Action:
+        # Keep all the dice
+        return RollDiceAction(dice_idx=[])
+
+    @abstractmethod
+    def take_action_on_play_cards(self, game_info: GameInfo) -> Action:
+        pass
+
+    def take_action_on_round_end(self, game_info: GameInfo) -> Action:
+        return _round_end_action(game_info.get_player_info())
+
+
+class AttackOnlyAgent(PhaseDispatchAgent):
+    __slots__ = ()
+
+    _EQUIPMENT_CARDS: Tuple[Tuple[str, Dict[ElementType, int], EntityType], ...] = (
+        (_KANTEN_SENMYOU_BLESSING, {ElementType.CRYO: 2}, EntityType.CHARACTER),
+        (_TRAVELERS_HANDY_SWORD, {ElementType.SAME: 2}, EntityType.WEAPON),
+        (_SACRIFICIAL_SWORD, {ElementType.SAME: 3}, EntityType.WEAPON),
+    )
+    """Cards to equip whenever affordable, in order: (name, cost, target entity type)"""
 
     def get_dice_idx_greedy(
         self,
         dice: List[ElementType],
         cost: Dict[ElementType, int],
         char_element: ElementType = ElementType.NONE,
-    ):
-        # First determine whether the current dice are enough
-        dice_idx = []
-        used = [False for _ in dice]
-        for key, val in cost.items():
-            remaining = val
-            if 1 <= key.value <= 7:
-                # 7 majors elements
-                remaining = val
-                for idx, die in enumerate(dice):
-                    if used[idx]:
-                        continue
-                    if idx not in dice_idx and die == key:
-                        remaining -= 1
-                        dice_idx.append(idx)
-                        used[idx] = True
-                        if remaining == 0:
-                            break
-                if remaining > 0:
-                    # Need to take OMNI elements
-                    for idx, die in enumerate(dice):
-                        if used[idx]:
-                            continue
-                        if idx not in dice_idx and die == ElementType.OMNI:
-                            remaining -= 1
-                            dice_idx.append(idx)
-                            used[idx] = True
-                            if remaining == 0:
-                                break
-                if remaining > 0:
-                    # Insufficient dice
-                    return []
-            elif key == ElementType.ANY:
-                # Arbitrary element
-                for idx, die in enumerate(dice):
-                    if used[idx]:
-                        continue
-                    if idx not in dice_idx and die != char_element:
-                        remaining -= 1
-                        dice_idx.append(idx)
-                        used[idx] = True
-                        if remaining == 0:
-                            break
-                if remaining > 0:
-                    # Insufficient unaligned dice: we first use the dice with character element
-                    for idx, die in enumerate(dice):
-                        if used[idx]:
-                            continue
-                        if idx not in dice_idx and die == char_element:
-                            remaining -= 1
-                            dice_idx.append(idx)
-                            used[idx] = True
-                            if remaining == 0:
-                                break
-                if remaining > 0:
-                    # Insufficient unaligned dice: we first use the dice with character element
-                    for idx, die in enumerate(dice):
-                        if used[idx]:
-                            continue
-                        if idx not in dice_idx and die == ElementType.OMNI:
-                            remaining -= 1
-                            dice_idx.append(idx)
-                            used[idx] = True
-                            if remaining == 0:
-                                break
-                if remaining > 0:
-                    return []
-            elif key == ElementType.SAME:
-                dice_counter = Counter(
-                    [dice[idx] for idx, die_used in enumerate(used) if not die_used]
-                )
-                if ElementType.OMNI not in dice_counter.keys():
-                    dice_counter[ElementType.OMNI] = 0
-                if char_element not in dice_counter.keys():
-                    dice_counter[char_element] = 0
-                sorted_counter = dict(
-                    sorted(dice_counter.items(), key=lambda item: item[1])
-                )
-                satisfied = False
-                for element, cnt in sorted_counter.items():
-                    if element in [ElementType.OMNI, char_element]:
-                        continue
-                    if cnt >= val:
-                        for idx, die in enumerate(dice):
-                            if used[idx]:
-                                continue
-                            if element == die:
-                                used[idx] = True
-                                dice_idx.append(idx)
-                                remaining -= 1
-                                if remaining == 0:
-                                    break
-                        satisfied = True
-                        break
-                if satisfied:
-                    continue
-                omni_count = sorted_counter[ElementType.OMNI]
-                sorted_counter = dict(
-                    sorted(dice_counter.items(), key=lambda item: item[1], reverse=True)
-                )
-                for element, cnt in sorted_counter.items():
-                    if element in [ElementType.OMNI, char_element]:
-                        continue
-                    if omni_count + cnt >= val:
-                        other_remaining = cnt
-                        omni_remaining = val - cnt
-                        for idx, die in enumerate(dice):
-                            if used[idx]:
-                                continue
-                            if element == die:
-                                other_remaining -= 1
-                                used[idx] = True
-                                dice_idx.append(idx)
-                            elif omni_remaining > 0 and die == ElementType.OMNI:
-                                omni_remaining -= 1
-                                used[idx] = True
-                                dice_idx.append(idx)
-                        if other_remaining == 0 and omni_remaining == 0:
-                            satisfied = True
-                            break
-                    break
-                if satisfied:
-                    continue
-                char_elem_count = dice_counter[char_element]
-                if char_elem_count + omni_count >= val:
-                    char_elem_remaining = min(char_elem_count, val)
-                    omni_remaining = val - char_elem_remaining
-                    for idx, die in enumerate(dice):
-                        if used[idx]:
-                            continue
-                        if char_element == die:
-                            char_elem_remaining -= 1
-                            used[idx] = True
-                            dice_idx.append(idx)
-                        elif omni_remaining > 0 and die == ElementType.OMNI:
-                            omni_remaining -= 1
-                            used[idx] = True
-                            dice_idx.append(idx)
-                        if char_elem_remaining == 0 and omni_remaining == 0:
-                            satisfied = True
-                            break
-                if not satisfied:
-                    return []
+    ) -> List[int]:
+        """Pick the dice to pay `cost`, or an empty list if the dice are insufficient"""
+        return _greedy_dice_alloc(dice, cost, char_element)
 
-        return dice_idx
+    def take_action_on_roll_dice(self, game_info: GameInfo) -> Action:
+        return RollDiceAction(dice_idx=_reroll_indices(game_info.get_player_info()))
 
-    def take_action(self, game_info: GameInfo) -> Action:
-        if game_info.status == GameStatus.INITIALIZING:
-            if game_info.phase == GamePhase.CHANGE_CARD:
-                return ChangeCardsAction(cards_idx=[])
-            elif game_info.phase == GamePhase.SELECT_ACTIVE_CHARACTER:
-                return ChangeCharacterAction(position=CharPos.MIDDLE, dice_idx=[])
-
-        elif game_info.status == GameStatus.RUNNING:
-            if game_info.phase == GamePhase.ROLL_DICE:
-                player_info = game_info.get_player_info()
-                active_pos = player_info.active_character_position
-                character_info = player_info.characters[active_pos.value]
-                # character_card = CHARACTER_CARDS[
-                #     CHARACTER_NAME2ID[character_info.character.name]
-                # ]
-                character_card = get_character_card("Kamisato Ayaka")
-                character_element = character_card.element_type
-                current_dice = player_info.dice_zone
-                reroll_dice_idx = []
-                for k, element_type in enumerate(current_dice):
-                    if element_type not in [character_element, ElementType.OMNI]:
-                        reroll_dice_idx.append(k)
-                return RollDiceAction(dice_idx=reroll_dice_idx)
-            elif game_info.phase == GamePhase.PLAY_CARDS:
-                player_info = game_info.get_player_info()
-                active_pos = player_info.active_character_position
-                character_info = player_info.characters[active_pos.value]
-                character_card = get_character_card(character_info.character.name)
-                if character_info.character.health_point <= 0:
-                    alive_positions = [
-                        CharPos(k)
-                        for k, character in enumerate(player_info.characters)
-                        if character.character.alive
-                    ]
-                    return ChangeCharacterAction(
-                        position=alive_positions[0], dice_idx=[]
-                    )
-                character_element = character_card.element_type
-                current_dice = player_info.dice_zone
-                skill_names = [skill.name for skill in character_card.skills]
-                elemental_burst = character_card.get_skill(
-                    skill_type=SkillType.ELEMENTAL_BURST
-                )
-                skill_name = ""
-                dice_idx = []
-
-                # Use the talent card of Kamisato Ayaka if appeared
-                if "Kanten Senmyou Blessing" in player_info.hand_cards:
-                    dice_idx = self.get_dice_idx_greedy(
-                        current_dice, {ElementType.CRYO: 2}, character_card.element_type
-                    )
-                    if len(dice_idx) > 0:
-                        card_idx = player_info.hand_cards.index(
-                            "Kanten Senmyou Blessing"
-                        )
-                        return UseCardAction(
-                            card_idx=card_idx,
-                            card_target=[
-                                (self.player_id, EntityType.CHARACTER, active_pos.value)
-                            ],
-                            dice_idx=dice_idx,
-                            card_user_pos=active_pos,
-                        )
-                if "Traveler's Handy Sword" in player_info.hand_cards:
-                    dice_idx = self.get_dice_idx_greedy(
-                        current_dice, {ElementType.SAME: 2}, character_card.element_type
-                    )
-                    if len(dice_idx) > 0:
-                        card_idx = player_info.hand_cards.index(
-                            "Traveler's Handy Sword"
-                        )
-                        return UseCardAction(
-                            card_idx=card_idx,
-                            card_target=[
-                                (self.player_id, EntityType.WEAPON, active_pos.value)
-                            ],
-                            dice_idx=dice_idx,
-                            card_user_pos=active_pos,
-                        )
-                if "Sacrificial Sword" in player_info.hand_cards:
-                    dice_idx = self.get_dice_idx_greedy(
-                        current_dice, {ElementType.SAME: 3}, character_card.element_type
-                    )
-                    if len(dice_idx) > 0:
-                        card_idx = player_info.hand_cards.index("Sacrificial Sword")
-                        return UseCardAction(
-                            card_idx=card_idx,
-                            card_target=[
-                                (self.player_id, EntityType.WEAPON, active_pos.value)
-                            ],
-                            dice_idx=dice_idx,
-                            card_user_pos=active_pos,
-                        )
-                if (
-                    character_info.character.power
-                    == elemental_burst.costs[ElementType.POWER]
-                ):
-                    dice_idx = self.get_dice_idx_greedy(
-                        current_dice, elemental_burst.costs, character_card.element_type
-                    )
-                    if len(dice_idx) > 0:
-                        skill_name = elemental_burst.name
-                if not dice_idx:
-                    # Insufficient power for elemental burst
-                    elemental_skill = character_card.get_skill(
-                        skill_type=SkillType.ELEMENTAL_SKILL
-                    )
-                    dice_idx = self.get_dice_idx_greedy(
-                        current_dice, elemental_skill.costs, character_card.element_type
-                    )
-                    if len(dice_idx) > 0:
-                        skill_name = elemental_skill.name
-                if not dice_idx:
-                    # Insufficient dice for elemental skill
-                    normal_attack = character_card.get_skill(
-                        skill_type=SkillType.NORMAL_ATTACK
-                    )
-                    dice_idx = self.get_dice_idx_greedy(
-                        current_dice, normal_attack.costs, character_card.element_type
-                    )
-                    if len(dice_idx) > 0:
-                        skill_name = normal_attack.name
-                if not dice_idx:
-                    # No skill applicable
-                    return DeclareEndAction()
-                else:
-                    return UseSkillAction(
-                        user_position=active_pos,
-                        skill_name=skill_name,
-                        dice_idx=dice_idx,
-                        skill_targets=[
-                            (
-                                ~self.player_id,
-                                game_info.get_opponent_info().active_character_position,
-                            )
-                        ],
-                    )
+    def take_action_on_play_cards(self, game_info: GameInfo) -> Action:
+        player_info = game_info.get_player_info()
+        active_pos = player_info.active_character_position
+        characters = player_info.characters
+        character = characters[active_pos.value].character
+        if not character.alive:
+            return ChangeCharacterAction(
+                position=_first_alive_pos(characters), dice_idx=[]
+            )
+        character_card = _card(character.name)
+        character_element = character_card.element_type
+        current_dice = player_info.dice_zone
+        dice_counts = _count_dice(current_dice)
+        elemental_burst = character_card.elemental_burst
+        skill_name: str = ""
+        dice_idx: List[int] = []
+        # Index of the first card with each name in hand
+        hand_index: Dict[str, int] = {}
+        for k, card_name in enumerate(player_info.hand_cards):
+            hand_index.setdefault(card_name, k)
 
-            elif game_info.phase == GamePhase.ROUND_END:
-                player_info = game_info.get_player_info()
-                active_pos = player_info.active_character_position
-                character_info = player_info.characters[active_pos.value]
-                if character_info.character.health_point <= 0:
-                    alive_positions = [
-                        CharPos(k)
-                        for k, character in enumerate(player_info.characters)
-                        if character.character.alive
-                    ]
-                    return ChangeCharacterAction(
-                        position=alive_positions[0], dice_idx=[]
+        # Equip the talent card of Kamisato Ayaka and the weapons if appeared
+        for card_name, card_cost, entity_type in self._EQUIPMENT_CARDS:
+            card_idx = hand_index.get(card_name)
+            if card_idx is None or not _can_afford(card_cost, dice_counts):
+                continue
+            dice_idx = _greedy_dice_alloc(
+                current_dice, card_cost, character_element, dice_counts
+            )
+            if len(dice_idx) > 0:
+                return UseCardAction(
+                    card_idx=card_idx,
+                    card_target=[(self.player_id, entity_type, active_pos.value)],
+                    dice_idx=dice_idx,
+                    card_user_pos=active_pos,
+                )
+        if (
+            elemental_burst is not None
+            and character.power == character_card.burst_power_cost
+            and _can_afford(elemental_burst.costs, dice_counts)
+        ):
+            dice_idx = _greedy_dice_alloc(
+                current_dice, elemental_burst.costs, character_element, dice_counts
+            )
+            if len(dice_idx) > 0:
+                skill_name = elemental_burst.name
+        if not dice_idx:
+            # Insufficient power for elemental burst
+            elemental_skill = character_card.elemental_skill
+            if elemental_skill is not None and _can_afford(
+                elemental_skill.costs, dice_counts
+            ):
+                dice_idx = _greedy_dice_alloc(
+                    current_dice, elemental_skill.costs, character_element, dice_counts
+                )
+                if len(dice_idx) > 0:
+                    skill_name = elemental_skill.name
+        if not dice_idx:
+            # Insufficient dice for elemental skill
+            normal_attack = character_card.normal_attack
+            if normal_attack is not None and _can_afford(
+                normal_attack.costs, dice_counts
+            ):
+                dice_idx = _greedy_dice_alloc(
+                    current_dice, normal_attack.costs, character_element, dice_counts
+                )
+                if len(dice_idx) > 0:
+                    skill_name = normal_attack.name
+        if not dice_idx:
+            # No skill applicable
+            return _DECLARE_END_ACTION
+        else:
+            return UseSkillAction(
+                user_position=active_pos,
+                skill_name=skill_name,
+                dice_idx=dice_idx,
+                skill_targets=[
+                    (
+                        ~self.player_id,
+                        game_info.get_opponent_info().active_character_position,
                     )
-        return DeclareEndAction()
+                ],
+            )
 
 
-class NoAttackAgent(Agent):
-    def __init__(self, player_id: PlayerID):
-        super().__init__(player_id)
+class NoAttackAgent(PhaseDispatchAgent):
+    __slots__ = ()
 
-    def take_action(self, game_info: GameInfo) -> Action:
-        if game_info.status == GameStatus.INITIALIZING:
-            if game_info.phase == GamePhase.CHANGE_CARD:
-                return ChangeCardsAction(cards_idx=[])
-            elif game_info.phase == GamePhase.SELECT_ACTIVE_CHARACTER:
-                return ChangeCharacterAction(position=CharPos.MIDDLE, dice_idx=[])
-
-        elif game_info.status == GameStatus.RUNNING:
-            if game_info.phase == GamePhase.ROLL_DICE:
-                player_info = game_info.get_player_info()
-                active_pos = player_info.active_character_position
-                character_info = player_info.characters[active_pos.value]
-                character_card = get_character_card("Kamisato Ayaka")
-                character_element = character_card.element_type
-                current_dice = player_info.dice_zone
-                reroll_dice_idx = []
-                for k, element_type in enumerate(current_dice):
-                    if element_type not in [character_element, ElementType.OMNI]:
-                        reroll_dice_idx.append(k)
-                return RollDiceAction(dice_idx=reroll_dice_idx)
-            elif game_info.phase in [GamePhase.PLAY_CARDS, GamePhase.ROUND_END]:
-                player_info = game_info.get_player_info()
-                active_pos = player_info.active_character_position
-                character_info = player_info.characters[active_pos.value]
-                if character_info.character.health_point <= 0:
-                    alive_positions = [
-                        CharPos(k)
-                        for k, character in enumerate(player_info.characters)
-                        if character.character.alive
-                    ]
-                    return ChangeCharacterAction(
-                        position=alive_positions[0], dice_idx=[]
-                    )
-                return DeclareEndAction()
+    def take_action_on_roll_dice(self, game_info: GameInfo) -> Action:
+        return RollDiceAction(dice_idx=_reroll_indices(game_info.get_player_info()))
 
-        return DeclareEndAction()
+    def take_action_on_play_cards(self, game_info: GameInfo) -> Action:
+        # Never attacks: only replaces the fallen active character, as in round end
+        return self.take_action_on_round_end(game_info)
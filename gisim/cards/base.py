@@ -1,7 +1,8 @@
+import sys
 from queue import PriorityQueue
 from typing import TYPE_CHECKING, Dict, cast
 
-from pydantic import BaseModel
+from pydantic import BaseModel, validator
 
 from gisim.classes.enums import (
     CardType,
@@ -33,6 +34,12 @@ class Card(BaseModel):
     combat_action: bool = False
     """Whether this card contains a combat action. e.g. most of the talents & Plunging Strike"""
 
+    @validator("name", always=True)
+    def name_validator(cls, v):
+        # Card names are used as dict keys by agents: intern them so that
+        # lookups with the same name mostly boil down to an identity check
+        return sys.intern(v)
+
     def use_card(
         self,
         msg_queue: PriorityQueue,  # PriorityQueue[Message]
@@ -4,7 +4,7 @@ Basic character card classes
 from queue import PriorityQueue
 from typing import TYPE_CHECKING, Dict, List, Optional, cast
 
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, Field, PrivateAttr, validator
 
 from gisim.classes.enums import AttackType, ElementType, Nation, SkillType, WeaponType
 from gisim.classes.message import (
@@ -172,6 +172,45 @@ class CharacterCard(BaseModel):
     power: int = 0
     max_power: int
     weapon_type: WeaponType
+    _normal_attack: Optional[CharacterSkill] = PrivateAttr(default=None)
+    _elemental_skill: Optional[CharacterSkill] = PrivateAttr(default=None)
+    _elemental_burst: Optional[CharacterSkill] = PrivateAttr(default=None)
+    _burst_power_cost: int = PrivateAttr(default=0)
+
+    def __init__(self, **data):
+        super().__init__(**data)
+        # Skills never change after construction: look them up once here
+        # so that agents could read them as plain attributes.
+        first_skills: Dict[SkillType, CharacterSkill] = {}
+        for skill in self.skills:
+            first_skills.setdefault(skill.type, skill)
+        self._normal_attack = first_skills.get(SkillType.NORMAL_ATTACK)
+        self._elemental_skill = first_skills.get(SkillType.ELEMENTAL_SKILL)
+        self._elemental_burst = first_skills.get(SkillType.ELEMENTAL_BURST)
+        if self._elemental_burst is not None:
+            self._burst_power_cost = self._elemental_burst.costs.get(
+                ElementType.POWER, 0
+            )
+
+    @property
+    def normal_attack(self) -> Optional[CharacterSkill]:
+        """The (first) normal attack of this character"""
+        return self._normal_attack
+
+    @property
+    def elemental_skill(self) -> Optional[CharacterSkill]:
+        """The (first) elemental skill of this character"""
+        return self._elemental_skill
+
+    @property
+    def elemental_burst(self) -> Optional[CharacterSkill]:
+        """The elemental burst of this character"""
+        return self._elemental_burst
+
+    @property
+    def burst_power_cost(self) -> int:
+        """Power required by the elemental burst"""
+        return self._burst_power_cost
 
     def get_skill(
         self,
@@ -20,6 +20,10 @@ from gisim.classes.enums import CharPos, EntityType, PlayerID, SkillType
 class Action(Entity, ABC):
     """Action includes cost information."""
 
+    class Config:
+        # Actions are read-only once taken, so they can be shared and reused
+        frozen = True
+
     def _check_cards_index(self, cards_idx: List[int]):
         assert type(cards_idx) == list
         for card in cards_idx:
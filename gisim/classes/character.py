@@ -141,8 +141,7 @@ class CharacterEntity(Entity):
                 skill = self.get_skill(skill_name=msg.skill_name)
                 msg.required_cost = skill.costs
                 msg_queue.put(msg)
-                if ElementType.POWER in skill.costs.keys():
-                    self.power = self.power - skill.costs[ElementType.POWER]
+                self.power -= skill.costs.get(ElementType.POWER, 0)
                 updated = True
         elif isinstance(msg, UseSkillMsg):
             msg = cast(UseSkillMsg, msg)
@@ -0,0 +1,57 @@
+import pytest
+
+from gisim.agent import (
+    AttackOnlyAgent,
+    _can_afford,
+    _count_dice,
+    _greedy_dice_alloc,
+)
+from gisim.classes.enums import ElementType, PlayerID
+
+OMNI = ElementType.OMNI
+CRYO = ElementType.CRYO
+HYDRO = ElementType.HYDRO
+PYRO = ElementType.PYRO
+
+CASES = [
+    # Element dice first, then OMNI for the gap
+    ([OMNI, CRYO, HYDRO, CRYO, OMNI], {CRYO: 3}, CRYO, [1, 3, 0]),
+    ([CRYO, OMNI], {CRYO: 1, ElementType.POWER: 2}, CRYO, [0]),
+    # ANY takes the dice without the character element first, OMNI included
+    ([CRYO, HYDRO, OMNI, CRYO, PYRO], {CRYO: 1, ElementType.ANY: 2}, CRYO, [0, 1, 2]),
+    ([CRYO, CRYO, HYDRO], {ElementType.ANY: 2}, CRYO, [2, 0]),
+    # SAME: the least element sufficient by itself, ties broken by first index
+    ([HYDRO, HYDRO, HYDRO, PYRO, PYRO], {ElementType.SAME: 2}, CRYO, [3, 4]),
+    ([HYDRO, PYRO, PYRO, HYDRO, CRYO, OMNI], {ElementType.SAME: 2}, CRYO, [0, 3]),
+    # SAME: use up the most element and fill the gap with OMNI
+    ([OMNI, HYDRO, PYRO, OMNI, HYDRO], {ElementType.SAME: 3}, CRYO, [0, 1, 4]),
+    ([PYRO, HYDRO, OMNI], {ElementType.SAME: 2}, CRYO, [0, 2]),
+    # SAME: fall back to the character element and OMNI
+    ([CRYO, OMNI, HYDRO, CRYO], {ElementType.SAME: 3}, CRYO, [0, 1, 3]),
+    # Insufficient dice
+    ([CRYO, OMNI], {CRYO: 3}, CRYO, []),
+    ([CRYO, HYDRO], {ElementType.ANY: 3}, CRYO, []),
+    ([HYDRO, PYRO, OMNI], {ElementType.SAME: 3}, CRYO, []),
+]
+
+
+@pytest.mark.parametrize("dice, cost, char_element, expected", CASES)
+def test_get_dice_idx_greedy(dice, cost, char_element, expected):
+    agent = AttackOnlyAgent(PlayerID.PLAYER1)
+    assert agent.get_dice_idx_greedy(dice, cost, char_element) == expected
+
+
+@pytest.mark.parametrize("dice, cost, char_element, expected", CASES)
+def test_greedy_dice_alloc_with_dice_counts(dice, cost, char_element, expected):
+    dice_counts = _count_dice(dice)
+    assert _greedy_dice_alloc(dice, cost, char_element, dice_counts) == expected
+    # The counts are shared between costs and must be left untouched
+    assert _greedy_dice_alloc(dice, cost, char_element, dice_counts) == expected
+
+
+@pytest.mark.parametrize(
+    "dice, cost", [(dice, cost) for dice, cost, _, expected in CASES if expected]
+)
+def test_can_afford_accepts_affordable_costs(dice, cost):
+    # `_can_afford` only filters out costs that are surely unaffordable
+    assert _can_afford(cost, _count_dice(dice))